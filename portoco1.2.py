@@ -1,13 +1,27 @@
 import sys
 import os
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QToolBar, QLineEdit,
     QTabBar, QMenu, QFileDialog, QInputDialog
 )
 from PySide6.QtGui import QAction, QFont, QKeySequence, QIcon
 from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtWebEngineCore import QWebEngineProfile
-from PySide6.QtCore import QUrl, Qt, QSize
+from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
+from PySide6.QtCore import QUrl, Qt, QSize, QTimer
+
+# URL-vs-search classification for the address bar: one hash lookup on the
+# last dotted component instead of a linear suffix scan per keypress.
+_SCHEMES = ("http://", "https://")
+_TLDS = frozenset({"com", "net", "org", "io", "gov", "edu", "co", "us", "uk", "ca", "de", "jp"})
+
+# Cap per-tab history so menu rebuilds and shutdown writes stay bounded.
+HISTORY_MAX_PER_TAB = 500
+
+# Decoded favicons kept per host; LRU-evicted beyond this many entries.
+FAVICON_CACHE_MAX = 200
+
 
 class Portoco(QMainWindow):
     def __init__(self):
@@ -19,10 +33,14 @@ class Portoco(QMainWindow):
         self.data_path = os.path.join(os.getcwd(), "portoco_data")
         os.makedirs(self.data_path, exist_ok=True)
 
-        # Persistent profile
-        self.profile = QWebEngineProfile.defaultProfile()
+        # Persistent profile — one explicit named profile shared by every
+        # tab instead of re-configuring the default profile each launch,
+        # with a bounded disk cache so revisits skip the network.
+        self.profile = QWebEngineProfile("Portoco", self)
         self.profile.setPersistentCookiesPolicy(QWebEngineProfile.ForcePersistentCookies)
         self.profile.setPersistentStoragePath(self.data_path)
+        self.profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+        self.profile.setHttpCacheMaximumSize(256 * 1024 * 1024)
 
         # Tabs
         self.tabs = QTabWidget()
@@ -83,23 +101,64 @@ class Portoco(QMainWindow):
         self.bookmarks_menu = menubar.addMenu("Bookmarks")
         self.history_menu = menubar.addMenu("History")
 
+        # Menus are rebuilt lazily: navigation only marks them dirty and the
+        # actual QAction work happens when the menu is about to show.
+        self.history_menu.aboutToShow.connect(self._populate_history_menu)
+        self._history_dirty = True
+        self._folder_menus = {}    # folder -> QMenu (cached between rebuilds)
+        self._folder_action_pools = {}  # folder -> [(open QAction, remove QAction)]
+        self._dirty_folders = set()
+        self._batch_depth = 0      # >0 suppresses menu rebuilds (see batch())
+        self._menu_dirty = False
+
         # Data storage
         self.bookmarks = {}  # folder -> list of (url, title)
-        self.history = {}    # tab -> list of urls
+        self._bm_urls = {}   # folder -> set of urls for O(1) duplicate checks
+        self.history = {}        # tab -> bounded deque of urls, oldest first
+        self._history_seen = {}  # tab -> set of urls for O(1) dedup
+
+        # Persisted history lives in its own bounded structure instead of
+        # being poured into whichever tab happens to be current at startup.
+        self._global_history = deque(maxlen=5000)
+        self._global_seen = set()
+
+        # host -> QIcon so revisited sites reuse the already-decoded favicon
+        self._favicon_cache = OrderedDict()
+
+        # Coalesce rapid urlChanged bursts (redirects, hash changes) into a
+        # single address-bar/history update; the latest URL wins.
+        self._pending_view = None
+        self._url_update_timer = QTimer(self)
+        self._url_update_timer.setSingleShot(True)
+        self._url_update_timer.setInterval(150)
+        self._url_update_timer.timeout.connect(self._flush_url_update)
 
         # Shortcuts
         self.init_shortcuts()
 
-        # Load persistent bookmarks/history
-        self.load_bookmarks()
-        self.load_history()
+        # Defer reading bookmarks/history off the startup path: the window
+        # and first tab come up right away and the data files are read once
+        # the event loop is running.
+        QTimer.singleShot(0, self._finish_init)
+
+        # Incremental persistence: mutations are appended to the open handles
+        # below and flushed on a debounce; the full rewrite only happens as
+        # periodic idle compaction, never on the shutdown path.
+        self._bm_log = open(os.path.join(self.data_path, "bookmarks.txt"), "a", encoding="utf-8")
+        self._hist_log = open(os.path.join(self.data_path, "history.txt"), "a", encoding="utf-8")
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(2000)
+        self._log_flush_timer.timeout.connect(self._flush_logs)
+        # Compaction only has work to do once records have been appended
+        self._appends_since_compact = 0
+        QTimer.singleShot(60000, self._compact)
 
         # Open first tab
         self.add_tab("https://duckduckgo.com")
 
-        # Save on exit
-        app.aboutToQuit.connect(self.save_bookmarks)
-        app.aboutToQuit.connect(self.save_history)
+        # Flush pending appends on exit (cheap; no full rewrite)
+        app.aboutToQuit.connect(self._flush_logs)
 
     # Shortcuts
     def init_shortcuts(self):
@@ -128,21 +187,27 @@ class Portoco(QMainWindow):
         prev_tab_sc.triggered.connect(lambda: self.tabs.setCurrentIndex((self.tabs.currentIndex()-1)%self.tabs.count()))
         self.addAction(prev_tab_sc)
 
+    def _finish_init(self):
+        self.load_bookmarks()
+        self.load_history_file()
+
     def current_tab(self):
         return self.tabs.currentWidget()
 
     # Tabs
     def add_tab(self, url):
         view = QWebEngineView()
+        view.setPage(QWebEnginePage(self.profile, view))
         view.setUrl(QUrl(url))
         view.setZoomFactor(1.0)
-        self.history[view] = [url]
+        self.history[view] = deque([url], maxlen=HISTORY_MAX_PER_TAB)
+        self._history_seen[view] = {url}
 
-        # Signals
-        view.urlChanged.connect(lambda u, v=view: self.update_url_bar(v))
-        view.titleChanged.connect(lambda t, v=view: self.update_tab_title(v, t))
-        view.urlChanged.connect(lambda u, v=view: self.update_history_menu(v))
-        view.iconChanged.connect(lambda i, v=view: self.update_tab_icon(v, i))
+        # Signals: shared bound slots recover the view via sender(), so no
+        # per-tab lambda closures are kept alive.
+        view.urlChanged.connect(self._on_url_changed)
+        view.titleChanged.connect(self._on_title_changed)
+        view.iconChanged.connect(self._on_icon_changed)
 
         # Downloads
         self.setup_downloads(view)
@@ -156,7 +221,43 @@ class Portoco(QMainWindow):
             tab = self.tabs.widget(index)
             if tab in self.history:
                 del self.history[tab]
+            self._history_seen.pop(tab, None)
+            if self._pending_view is tab:
+                self._pending_view = None
             self.tabs.removeTab(index)
+            # Release the renderer promptly instead of leaving the view
+            # alive on the Qt parent chain.
+            tab.page().setUrl(QUrl("about:blank"))
+            tab.page().deleteLater()
+            tab.deleteLater()
+
+    def _remember_url(self, view, url):
+        """Record a visited URL, evicting the oldest once the cap is hit.
+
+        Returns True when the URL was new for this tab, so callers can skip
+        marking the History menu dirty for repeat visits.
+        """
+        seen = self._history_seen[view]
+        if url in seen:
+            return False
+        urls = self.history[view]
+        if len(urls) == urls.maxlen:
+            seen.discard(urls[0])
+        urls.append(url)
+        seen.add(url)
+        self._remember_global(url)
+        self._hist_log.write(url + "\n")
+        self._appends_since_compact += 1
+        self._log_flush_timer.start()
+        return True
+
+    def _remember_global(self, url):
+        if url in self._global_seen:
+            return
+        if len(self._global_history) == self._global_history.maxlen:
+            self._global_seen.discard(self._global_history[0])
+        self._global_history.append(url)
+        self._global_seen.add(url)
 
     # Downloads
     def setup_downloads(self, view: QWebEngineView):
@@ -179,30 +280,57 @@ class Portoco(QMainWindow):
         if not text:
             return
 
+        # Fast path: an already well-formed URL needs no classification
+        if text.startswith(_SCHEMES):
+            self._navigate(text)
+            return
+
         # Smart URL vs search
-        tlds = [".com", ".net", ".org", ".io", ".gov", ".edu", ".co", ".us", ".uk", ".ca", ".de", ".jp"]
-        if any(text.endswith(tld) for tld in tlds):
-            if not text.startswith(("http://", "https://")):
-                text = "http://" + text
+        dot = text.rfind(".")
+        if dot != -1 and text[dot + 1:].split("/", 1)[0].lower() in _TLDS:
+            text = "http://" + text
         else:
             query = text.replace(" ", "+")
             text = f"https://duckduckgo.com/?q={query}"
+        self._navigate(text)
 
+    def _navigate(self, text):
         current = self.current_tab()
         if current:
             current.setUrl(QUrl(text))
             current.setFocus()
-            if text not in self.history[current]:
-                self.history[current].append(text)
-            self.update_history_menu(current.url())
+            if self._remember_url(current, text):
+                self._history_dirty = True
+
+    def _on_url_changed(self):
+        self._queue_url_update(self.sender())
+
+    def _on_title_changed(self, title):
+        self.update_tab_title(self.sender(), title)
+
+    def _on_icon_changed(self, icon):
+        self.update_tab_icon(self.sender(), icon)
+
+    def _queue_url_update(self, view):
+        # The timer is shared, so a different tab firing within the window
+        # must not displace a queued update — flush it through first
+        if self._pending_view is not None and self._pending_view is not view:
+            self._flush_url_update()
+        self._pending_view = view
+        self._url_update_timer.start()
+
+    def _flush_url_update(self):
+        view = self._pending_view
+        self._pending_view = None
+        if view is not None and view in self.history:
+            self.update_url_bar(view)
 
     def update_url_bar(self, view):
         url = view.url().toString()
         if view == self.current_tab():
             self.url_bar.setText(url)
-        if url not in self.history[view]:
-            self.history[view].append(url)
-        self.update_history_menu(view.url())
+        if self._remember_url(view, url):
+            self._history_dirty = True
 
     def update_tab_title(self, view, title):
         index = self.tabs.indexOf(view)
@@ -211,8 +339,16 @@ class Portoco(QMainWindow):
 
     def update_tab_icon(self, view, icon: QIcon):
         index = self.tabs.indexOf(view)
-        if index >= 0:
-            self.tabs.setTabIcon(index, icon)
+        if index < 0:
+            return
+        host = view.url().host()
+        if not icon.isNull():
+            self._favicon_cache[host] = icon
+            self._favicon_cache.move_to_end(host)
+            if len(self._favicon_cache) > FAVICON_CACHE_MAX:
+                self._favicon_cache.popitem(last=False)
+        cached = self._favicon_cache.get(host)
+        self.tabs.setTabIcon(index, icon if cached is None else cached)
 
     # Bookmarks
     def add_bookmark(self):
@@ -228,34 +364,96 @@ class Portoco(QMainWindow):
         if folder not in self.bookmarks:
             self.bookmarks[folder] = []
 
-        if url in [b[0] for b in self.bookmarks[folder]]:
+        urls = self._bm_urls.setdefault(folder, set())
+        if url in urls:
             return
+        urls.add(url)
 
         self.bookmarks[folder].append((url, title))
+        self._dirty_folders.add(folder)
         self.build_bookmarks_menu()
+        self._bm_log.write(f"{folder}|{title}|{url}\n")
+        self._appends_since_compact += 1
+        self._log_flush_timer.start()
 
     def remove_bookmark(self, folder, url):
         if folder in self.bookmarks:
             self.bookmarks[folder] = [b for b in self.bookmarks[folder] if b[0] != url]
+            self._bm_urls.get(folder, set()).discard(url)
             if not self.bookmarks[folder]:
                 del self.bookmarks[folder]
+                self._bm_urls.pop(folder, None)
+            self._dirty_folders.add(folder)
             self.build_bookmarks_menu()
+            # The append log cannot express a removal, so rewrite right away
+            self.save_bookmarks()
+
+    @contextmanager
+    def batch(self):
+        """Suppress menu rebuilds inside the block; fire one at the end."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._menu_dirty:
+                self._menu_dirty = False
+                self.build_bookmarks_menu()
 
     def build_bookmarks_menu(self):
-        self.bookmarks_menu.clear()
-        for folder, bookmarks in self.bookmarks.items():
+        if self._batch_depth:
+            self._menu_dirty = True
+            return
+        # Only rebuild folders that actually changed; untouched submenus keep
+        # their cached QMenu (and its actions) as-is.
+        for folder in self._dirty_folders or set(self.bookmarks):
+            self._rebuild_folder(folder)
+        self._dirty_folders.clear()
+
+    def _rebuild_folder(self, folder):
+        folder_menu = self._folder_menus.get(folder)
+        if folder not in self.bookmarks:
+            if folder_menu is not None:
+                self.bookmarks_menu.removeAction(folder_menu.menuAction())
+                del self._folder_menus[folder]
+                self._folder_action_pools.pop(folder, None)
+            return
+        if folder_menu is None:
             folder_menu = QMenu(folder, self)
             folder_menu.setTearOffEnabled(True)
-            for url, title in bookmarks:
-                action = QAction(title, self)
-                action.triggered.connect(lambda checked, u=url: self.load_bookmark(u))
-                folder_menu.addAction(action)
-
-                remove_action = QAction(f"Remove '{title}'", self)
-                remove_action.triggered.connect(lambda checked, f=folder, u=url: self.remove_bookmark(f, u))
-                folder_menu.addAction(remove_action)
-
+            self._folder_menus[folder] = folder_menu
             self.bookmarks_menu.addMenu(folder_menu)
+        # Reuse pooled QActions across rebuilds: retitle/redata existing
+        # ones, grow the pool only when the folder grew, hide the surplus.
+        pool = self._folder_action_pools.setdefault(folder, [])
+        entries = self.bookmarks[folder]
+        for i, (url, title) in enumerate(entries):
+            if i < len(pool):
+                open_action, remove_action = pool[i]
+            else:
+                open_action = QAction(self)
+                open_action.triggered.connect(self._on_bookmark_triggered)
+                remove_action = QAction(self)
+                remove_action.triggered.connect(self._on_remove_bookmark_triggered)
+                folder_menu.addAction(open_action)
+                folder_menu.addAction(remove_action)
+                pool.append((open_action, remove_action))
+            open_action.setText(title)
+            open_action.setData(url)
+            open_action.setVisible(True)
+            remove_action.setText(f"Remove '{title}'")
+            remove_action.setData((folder, url))
+            remove_action.setVisible(True)
+        for open_action, remove_action in pool[len(entries):]:
+            open_action.setVisible(False)
+            remove_action.setVisible(False)
+
+    def _on_bookmark_triggered(self):
+        self.load_bookmark(self.sender().data())
+
+    def _on_remove_bookmark_triggered(self):
+        folder, url = self.sender().data()
+        self.remove_bookmark(folder, url)
 
     def load_bookmark(self, url):
         current = self.current_tab()
@@ -264,55 +462,98 @@ class Portoco(QMainWindow):
 
     def save_bookmarks(self):
         path = os.path.join(self.data_path, "bookmarks.txt")
-        with open(path, "w", encoding="utf-8") as f:
-            for folder, bookmarks in self.bookmarks.items():
-                for url, title in bookmarks:
-                    f.write(f"{folder}|{title}|{url}\n")
+        with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.writelines(
+                f"{folder}|{title}|{url}\n"
+                for folder, bookmarks in self.bookmarks.items()
+                for url, title in bookmarks
+            )
 
     def load_bookmarks(self):
         path = os.path.join(self.data_path, "bookmarks.txt")
         if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    parts = line.strip().split("|", 2)
-                    if len(parts) != 3:
+            with self.batch(), open(path, "r", encoding="utf-8") as f:
+                # One bulk read; partition avoids the per-line list that
+                # split() would allocate.
+                for line in f.read().splitlines():
+                    folder, sep1, rest = line.partition("|")
+                    if not sep1:
+                        continue
+                    title, sep2, url = rest.partition("|")
+                    if not sep2:
                         continue
-                    folder, title, url = parts
                     if folder not in self.bookmarks:
                         self.bookmarks[folder] = []
+                    # The append log may repeat compacted records
+                    urls = self._bm_urls.setdefault(folder, set())
+                    if url in urls:
+                        continue
+                    urls.add(url)
                     self.bookmarks[folder].append((url, title))
         self.build_bookmarks_menu()
 
     # History
-    def update_history_menu(self, qurl):
+    def _populate_history_menu(self):
+        if not self._history_dirty:
+            return
         self.history_menu.clear()
+        shown = set()
         current = self.current_tab()
         if current:
             for url in reversed(self.history[current]):
-                action = QAction(url, self)
-                action.triggered.connect(lambda checked, u=url: self.load_history(u))
-                self.history_menu.addAction(action)
-
-    def load_history(self, url):
+                shown.add(url)
+                self._add_history_action(url)
+        # Older entries from previous sessions follow the current tab's
+        for url in reversed(self._global_history):
+            if url not in shown:
+                self._add_history_action(url)
+        self._history_dirty = False
+
+    def _add_history_action(self, url):
+        action = QAction(url, self)
+        action.setData(url)
+        action.triggered.connect(self._on_history_triggered)
+        self.history_menu.addAction(action)
+
+    def _on_history_triggered(self):
+        self.navigate_to_history(self.sender().data())
+
+    def navigate_to_history(self, url):
         current = self.current_tab()
         current.setUrl(QUrl(url))
         current.setFocus()
 
     def save_history(self):
         path = os.path.join(self.data_path, "history.txt")
-        with open(path, "w", encoding="utf-8") as f:
-            for tab, urls in self.history.items():
-                for url in urls:
-                    f.write(f"{url}\n")
+        with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.writelines(f"{url}\n" for url in self._global_history)
 
-    def load_history(self):
+    def load_history_file(self):
         path = os.path.join(self.data_path, "history.txt")
         if os.path.exists(path):
             with open(path, "r", encoding="utf-8") as f:
-                for line in f:
+                for line in f.read().splitlines():
                     url = line.strip()
-                    if self.current_tab():
-                        self.history[self.current_tab()].append(url)
+                    if url:
+                        self._remember_global(url)
+
+    # Persistence plumbing
+    def _flush_logs(self):
+        self._bm_log.flush()
+        self._hist_log.flush()
+
+    def _compact(self):
+        """Idle-time rewrite of the data files from in-memory state.
+
+        Keeps the on-disk files from growing with stale appended records;
+        reschedules itself rather than running on shutdown, and skips the
+        cycle entirely while the browser is idle.
+        """
+        if self._appends_since_compact:
+            self._appends_since_compact = 0
+            self.save_bookmarks()
+            self.save_history()
+        QTimer.singleShot(60000, self._compact)
 
     # Update address bar when switching tabs
     def update_url(self, index):
@@ -320,6 +561,20 @@ class Portoco(QMainWindow):
         if view:
             self.url_bar.setText(view.url().toString())
             view.setFocus()
+        self._freeze_background_tabs(index)
+        self._history_dirty = True
+
+    def _freeze_background_tabs(self, index):
+        # Stop JS timers/animations in non-current tabs (Qt 6.5+ lifecycle
+        # API); older Qt just keeps them running as before.
+        if not hasattr(QWebEnginePage, "LifecycleState"):
+            return
+        for i in range(self.tabs.count()):
+            page = self.tabs.widget(i).page()
+            if i == index:
+                page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+            else:
+                page.setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
 
 # Main
 if __name__ == "__main__":
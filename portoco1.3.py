@@ -1,591 +1,878 @@
-import sys
-import os
-
-from PySide6.QtWidgets import (
-    QApplication,
-    QMainWindow,
-    QWidget,
-    QVBoxLayout,
-    QLineEdit,
-    QTabWidget,
-    QMenu,
-    QInputDialog,
-    QToolBar,
-    QPushButton,
-)
-from PySide6.QtGui import QAction, QKeySequence, QIcon, QPalette
-from PySide6.QtCore import QUrl, Qt, QSize
-from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
-
-
-# --------------------------------------------------
-# Main Window
-# --------------------------------------------------
-
-class Portoco(QMainWindow):
-    def __init__(self):
-        super().__init__()
-
-        self.setWindowTitle("Portoco")
-        self.resize(1200, 800)
-
-        # ---------- data folder ----------
-        self.data_path = os.path.join(os.getcwd(), "portoco_data")
-        os.makedirs(self.data_path, exist_ok=True)
-
-        # ---------- web profile ----------
-        self.profile = QWebEngineProfile("PortocoProfile", self)
-        self.profile.setPersistentStoragePath(self.data_path)
-        self.profile.setCachePath(self.data_path)
-        self.profile.setPersistentCookiesPolicy(
-            QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies
-        )
-        
-        # Performance optimizations
-        settings = self.profile.settings()
-        settings.setAttribute(settings.WebAttribute.PluginsEnabled, True)
-        settings.setAttribute(settings.WebAttribute.JavascriptEnabled, True)
-        settings.setAttribute(settings.WebAttribute.LocalStorageEnabled, True)
-        settings.setAttribute(settings.WebAttribute.AllowRunningInsecureContent, False)
-        
-        # Enable HTTP/2
-        self.profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.MemoryHttpCache)
-        self.profile.setHttpCacheMaximumSize(100 * 1024 * 1024)  # 100MB cache
-
-        # ---------- bookmarks ----------
-        self.bookmarks = {}  # folder -> [(title, url)]
-
-        # ---------- detect dark mode ----------
-        self.is_dark_mode = self.is_system_dark_mode()
-
-        # ---------- UI ----------
-        self.init_ui()
-        self.init_menu()
-        self.init_shortcuts()
-        self.apply_styles()
-
-        # ---------- first tab ----------
-        self.add_tab("https://duckduckgo.com")
-
-    def is_system_dark_mode(self):
-        """Detect if system is in dark mode"""
-        palette = QApplication.palette()
-        bg_color = palette.color(QPalette.ColorRole.Window)
-        # If background is dark (luminance < 128), it's dark mode
-        return bg_color.lightness() < 128
-
-    # --------------------------------------------------
-    # UI
-    # --------------------------------------------------
-
-    def init_ui(self):
-        central = QWidget()
-        self.setCentralWidget(central)
-
-        layout = QVBoxLayout(central)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(0)
-
-        # Navigation toolbar
-        nav_toolbar = QToolBar()
-        nav_toolbar.setMovable(False)
-        nav_toolbar.setIconSize(QSize(14, 14))
-        nav_toolbar.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextBesideIcon)
-        self.addToolBar(nav_toolbar)
-
-        # Back button
-        back_btn = QAction("←", self)
-        back_btn.setToolTip("Back")
-        back_btn.triggered.connect(self.navigate_back)
-        nav_toolbar.addAction(back_btn)
-
-        # Forward button
-        forward_btn = QAction("→", self)
-        forward_btn.setToolTip("Forward")
-        forward_btn.triggered.connect(self.navigate_forward)
-        nav_toolbar.addAction(forward_btn)
-
-        # Reload button
-        reload_btn = QAction("⟳", self)
-        reload_btn.setToolTip("Reload")
-        reload_btn.triggered.connect(self.reload_page)
-        nav_toolbar.addAction(reload_btn)
-
-        nav_toolbar.addSeparator()
-
-        # URL bar
-        self.url_bar = QLineEdit()
-        self.url_bar.setPlaceholderText("Search or enter URL...")
-        self.url_bar.returnPressed.connect(self.navigate)
-        nav_toolbar.addWidget(self.url_bar)
-
-        # New tab button
-        new_tab_btn = QPushButton("+")
-        new_tab_btn.setToolTip("New Tab (Ctrl+T)")
-        new_tab_btn.setFixedSize(24, 24)
-        new_tab_btn.clicked.connect(lambda: self.add_tab("https://duckduckgo.com"))
-        nav_toolbar.addWidget(new_tab_btn)
-
-        # Bookmark button
-        bookmark_btn = QAction("⭐", self)
-        bookmark_btn.setToolTip("Add Bookmark")
-        bookmark_btn.triggered.connect(self.add_bookmark)
-        nav_toolbar.addAction(bookmark_btn)
-
-        # Tabs
-        self.tabs = QTabWidget()
-        self.tabs.setDocumentMode(True)
-        self.tabs.setTabsClosable(True)
-        self.tabs.setMovable(True)
-        self.tabs.setElideMode(Qt.TextElideMode.ElideRight)
-        self.tabs.tabCloseRequested.connect(self.close_tab)
-        self.tabs.currentChanged.connect(self.sync_url_bar)
-
-        layout.addWidget(self.tabs)
-
-    def apply_styles(self):
-        if self.is_dark_mode:
-            # Dark mode styles
-            self.setStyleSheet("""
-                QMainWindow {
-                    background-color: #1e1e1e;
-                }
-                
-                QToolBar {
-                    background-color: #2d2d2d;
-                    border-bottom: 1px solid #3d3d3d;
-                    padding: 3px;
-                    spacing: 3px;
-                }
-                
-                QToolBar QToolButton {
-                    background-color: transparent;
-                    border: none;
-                    border-radius: 3px;
-                    padding: 3px 6px;
-                    font-size: 13px;
-                    color: #ffffff;
-                }
-                
-                QToolBar QToolButton:hover {
-                    background-color: #3d3d3d;
-                }
-                
-                QToolBar QToolButton:pressed {
-                    background-color: #4d4d4d;
-                }
-                
-                QLineEdit {
-                    border: 1px solid #3d3d3d;
-                    border-radius: 12px;
-                    padding: 4px 10px;
-                    background-color: #1e1e1e;
-                    font-size: 12px;
-                    color: #ffffff;
-                }
-                
-                QLineEdit:focus {
-                    border: 1px solid #4a90e2;
-                    background-color: #2d2d2d;
-                }
-                
-                QPushButton {
-                    background-color: #3d3d3d;
-                    border: 1px solid #4d4d4d;
-                    border-radius: 12px;
-                    font-size: 14px;
-                    font-weight: bold;
-                    color: #ffffff;
-                }
-                
-                QPushButton:hover {
-                    background-color: #4d4d4d;
-                    border-color: #5d5d5d;
-                }
-                
-                QPushButton:pressed {
-                    background-color: #5d5d5d;
-                }
-                
-                QTabWidget::pane {
-                    border: none;
-                    background-color: #2d2d2d;
-                }
-                
-                QTabBar::tab {
-                    background-color: #2d2d2d;
-                    border: none;
-                    border-top-left-radius: 4px;
-                    border-top-right-radius: 4px;
-                    padding: 5px 10px;
-                    margin-right: 2px;
-                    min-width: 80px;
-                    max-width: 180px;
-                    color: #b0b0b0;
-                    font-size: 12px;
-                }
-                
-                QTabBar::tab:selected {
-                    background-color: #1e1e1e;
-                    border-bottom: 2px solid #4a90e2;
-                    color: #ffffff;
-                }
-                
-                QTabBar::tab:hover:!selected {
-                    background-color: #3d3d3d;
-                    color: #ffffff;
-                }
-                
-                QTabBar::close-button {
-                    image: none;
-                    subcontrol-position: right;
-                    background-color: #d32f2f;
-                    border-radius: 2px;
-                    padding: 2px;
-                    width: 12px;
-                    height: 12px;
-                }
-                
-                QTabBar::close-button:hover {
-                    background-color: #f44336;
-                }
-                
-                QMenu {
-                    background-color: #2d2d2d;
-                    border: 1px solid #3d3d3d;
-                    border-radius: 4px;
-                    padding: 3px;
-                    color: #ffffff;
-                }
-                
-                QMenu::item {
-                    padding: 4px 20px;
-                    border-radius: 3px;
-                }
-                
-                QMenu::item:selected {
-                    background-color: #4a90e2;
-                    color: #ffffff;
-                }
-            """)
-        else:
-            # Light mode styles
-            self.setStyleSheet("""
-                QMainWindow {
-                    background-color: #f5f5f5;
-                }
-                
-                QToolBar {
-                    background-color: #ffffff;
-                    border-bottom: 1px solid #e0e0e0;
-                    padding: 3px;
-                    spacing: 3px;
-                }
-                
-                QToolBar QToolButton {
-                    background-color: transparent;
-                    border: none;
-                    border-radius: 3px;
-                    padding: 3px 6px;
-                    font-size: 13px;
-                    color: #000000;
-                }
-                
-                QToolBar QToolButton:hover {
-                    background-color: #e8e8e8;
-                }
-                
-                QToolBar QToolButton:pressed {
-                    background-color: #d0d0d0;
-                }
-                
-                QLineEdit {
-                    border: 1px solid #d0d0d0;
-                    border-radius: 12px;
-                    padding: 4px 10px;
-                    background-color: #f8f8f8;
-                    font-size: 12px;
-                    color: #000000;
-                }
-                
-                QLineEdit:focus {
-                    border: 1px solid #4a90e2;
-                    background-color: #ffffff;
-                }
-                
-                QPushButton {
-                    background-color: #f0f0f0;
-                    border: 1px solid #d0d0d0;
-                    border-radius: 12px;
-                    font-size: 14px;
-                    font-weight: bold;
-                    color: #555;
-                }
-                
-                QPushButton:hover {
-                    background-color: #e0e0e0;
-                    border-color: #b0b0b0;
-                }
-                
-                QPushButton:pressed {
-                    background-color: #d0d0d0;
-                }
-                
-                QTabWidget::pane {
-                    border: none;
-                    background-color: #ffffff;
-                }
-                
-                QTabBar::tab {
-                    background-color: #e8e8e8;
-                    border: none;
-                    border-top-left-radius: 4px;
-                    border-top-right-radius: 4px;
-                    padding: 5px 10px;
-                    margin-right: 2px;
-                    min-width: 80px;
-                    max-width: 180px;
-                    color: #555555;
-                    font-size: 12px;
-                }
-                
-                QTabBar::tab:selected {
-                    background-color: #ffffff;
-                    border-bottom: 2px solid #4a90e2;
-                    color: #000000;
-                }
-                
-                QTabBar::tab:hover:!selected {
-                    background-color: #d8d8d8;
-                }
-                
-                QTabBar::close-button {
-                    image: none;
-                    subcontrol-position: right;
-                    background-color: #d32f2f;
-                    border-radius: 2px;
-                    padding: 2px;
-                    width: 12px;
-                    height: 12px;
-                }
-                
-                QTabBar::close-button:hover {
-                    background-color: #f44336;
-                }
-                
-                QMenu {
-                    background-color: #ffffff;
-                    border: 1px solid #d0d0d0;
-                    border-radius: 4px;
-                    padding: 3px;
-                    color: #000000;
-                }
-                
-                QMenu::item {
-                    padding: 4px 20px;
-                    border-radius: 3px;
-                }
-                
-                QMenu::item:selected {
-                    background-color: #4a90e2;
-                    color: #ffffff;
-                }
-            """)
-
-    # --------------------------------------------------
-    # Navigation Controls
-    # --------------------------------------------------
-
-    def navigate_back(self):
-        current = self.current_tab()
-        if current:
-            current.back()
-
-    def navigate_forward(self):
-        current = self.current_tab()
-        if current:
-            current.forward()
-
-    def reload_page(self):
-        current = self.current_tab()
-        if current:
-            current.reload()
-
-    # --------------------------------------------------
-    # Tabs
-    # --------------------------------------------------
-
-    def add_tab(self, url=None):
-        # Create a page with the profile first
-        page = QWebEnginePage(self.profile, self)
-        
-        # Create view and set the page
-        view = QWebEngineView()
-        view.setPage(page)
-
-        if url:
-            view.setUrl(QUrl(url))
-
-        index = self.tabs.addTab(view, "New Tab")
-        self.tabs.setCurrentIndex(index)
-
-        view.urlChanged.connect(
-            lambda qurl, v=view: self.update_tab(v, qurl)
-        )
-        view.loadFinished.connect(
-            lambda _, v=view: self.update_tab(v, v.url())
-        )
-
-    def close_tab(self, index):
-        if self.tabs.count() > 1:
-            self.tabs.removeTab(index)
-
-    def update_tab(self, view, qurl):
-        i = self.tabs.indexOf(view)
-        if i != -1:
-            title = view.page().title() or "New Tab"
-            # Limit tab title length
-            if len(title) > 20:
-                title = title[:17] + "..."
-            self.tabs.setTabText(i, title)
-        if view == self.tabs.currentWidget():
-            self.url_bar.setText(qurl.toString())
-
-    def current_tab(self):
-        return self.tabs.currentWidget()
-
-    # --------------------------------------------------
-    # Navigation
-    # --------------------------------------------------
-
-    def navigate(self):
-        text = self.url_bar.text().strip()
-        if not text:
-            return
-
-        if " " in text or "." not in text:
-            text = f"https://duckduckgo.com/?q={text.replace(' ', '+')}"
-        elif not text.startswith("http"):
-            text = "https://" + text
-
-        self.current_tab().setUrl(QUrl(text))
-
-    def sync_url_bar(self, index):
-        view = self.tabs.widget(index)
-        if view:
-            self.url_bar.setText(view.url().toString())
-
-    # --------------------------------------------------
-    # Menu
-    # --------------------------------------------------
-
-    def init_menu(self):
-        menubar = self.menuBar()
-
-        file_menu = menubar.addMenu("File")
-        new_tab = QAction("New Tab", self)
-        new_tab.triggered.connect(
-            lambda: self.add_tab("https://duckduckgo.com")
-        )
-        file_menu.addAction(new_tab)
-
-        self.bookmarks_menu = menubar.addMenu("Bookmarks")
-        add_bm = QAction("Add Bookmark", self)
-        add_bm.triggered.connect(self.add_bookmark)
-        self.bookmarks_menu.addAction(add_bm)
-        self.bookmarks_menu.addSeparator()
-
-    def init_shortcuts(self):
-        new_tab = QAction(self)
-        new_tab.setShortcut(QKeySequence("Ctrl+T"))
-        new_tab.triggered.connect(
-            lambda: self.add_tab("https://duckduckgo.com")
-        )
-        self.addAction(new_tab)
-
-    # --------------------------------------------------
-    # Bookmarks
-    # --------------------------------------------------
-
-    def add_bookmark(self):
-        current = self.current_tab()
-        if not current:
-            return
-
-        url = current.url().toString()
-        title = current.page().title() or url
-
-        folders = list(self.bookmarks.keys())
-
-        # Folder selector
-        if folders:
-            folder, ok = QInputDialog.getItem(
-                self,
-                "Choose Bookmark Folder",
-                "Select a folder:",
-                folders + ["➕ Create new folder"],
-                0,
-                False
-            )
-            if not ok:
-                return
-
-            if folder == "➕ Create new folder":
-                folder, ok = QInputDialog.getText(
-                    self,
-                    "New Folder",
-                    "Folder name:"
-                )
-                if not ok or not folder.strip():
-                    return
-                folder = folder.strip()
-        else:
-            folder, ok = QInputDialog.getText(
-                self,
-                "New Folder",
-                "Folder name:",
-                text="Bookmarks"
-            )
-            if not ok or not folder.strip():
-                return
-            folder = folder.strip()
-
-        if folder not in self.bookmarks:
-            self.bookmarks[folder] = []
-
-        # Prevent duplicates
-        if url in [u for _, u in self.bookmarks[folder]]:
-            return
-
-        self.bookmarks[folder].append((title, url))
-        self.build_bookmarks_menu()
-
-    def build_bookmarks_menu(self):
-        self.bookmarks_menu.clear()
-
-        add_bm = QAction("Add Bookmark", self)
-        add_bm.triggered.connect(self.add_bookmark)
-        self.bookmarks_menu.addAction(add_bm)
-        self.bookmarks_menu.addSeparator()
-
-        for folder, bookmarks in self.bookmarks.items():
-            folder_menu = QMenu(folder, self)
-            for title, url in bookmarks:
-                action = QAction(title, self)
-                action.triggered.connect(
-                    lambda checked=False, u=url: self.current_tab().setUrl(QUrl(u))
-                )
-                folder_menu.addAction(action)
-            self.bookmarks_menu.addMenu(folder_menu)
-
-
-# --------------------------------------------------
-# Run
-# --------------------------------------------------
-
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    browser = Portoco()
-    browser.show()
-    sys.exit(app.exec())
+import sys
+import os
+import re
+import sqlite3
+from functools import partial
+from urllib.parse import urlencode
+
+from PySide6.QtWidgets import (
+    QApplication,
+    QMainWindow,
+    QWidget,
+    QVBoxLayout,
+    QLineEdit,
+    QTabWidget,
+    QMenu,
+    QInputDialog,
+    QToolBar,
+    QPushButton,
+    QLabel,
+)
+from PySide6.QtGui import QAction, QKeySequence, QIcon, QPalette
+from PySide6.QtCore import QUrl, Qt, QSize, QTimer, QStandardPaths
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest
+from PySide6.QtWebEngineWidgets import QWebEngineView
+from PySide6.QtWebEngineCore import (
+    QWebEngineProfile,
+    QWebEnginePage,
+    QWebEngineUrlRequestInterceptor,
+)
+
+
+# Resolved once per process: the OS-conventional app-data directory
+# instead of whatever the current working directory happens to be.
+_DATA_PATH = os.path.join(
+    QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation),
+    "portoco_data",
+)
+if not os.path.isdir(_DATA_PATH):
+    os.makedirs(_DATA_PATH, exist_ok=True)
+
+
+# Stylesheets are parsed by Qt on every setStyleSheet call; keeping the
+# literals at module scope means one constant per process and lets
+# apply_styles skip the call entirely when the theme is unchanged.
+_DARK_QSS = """
+                QMainWindow {
+                    background-color: #1e1e1e;
+                }
+                
+                QToolBar {
+                    background-color: #2d2d2d;
+                    border-bottom: 1px solid #3d3d3d;
+                    padding: 3px;
+                    spacing: 3px;
+                }
+                
+                QToolBar QToolButton {
+                    background-color: transparent;
+                    border: none;
+                    border-radius: 3px;
+                    padding: 3px 6px;
+                    font-size: 13px;
+                    color: #ffffff;
+                }
+                
+                QToolBar QToolButton:hover {
+                    background-color: #3d3d3d;
+                }
+                
+                QToolBar QToolButton:pressed {
+                    background-color: #4d4d4d;
+                }
+                
+                QLineEdit {
+                    border: 1px solid #3d3d3d;
+                    border-radius: 12px;
+                    padding: 4px 10px;
+                    background-color: #1e1e1e;
+                    font-size: 12px;
+                    color: #ffffff;
+                }
+                
+                QLineEdit:focus {
+                    border: 1px solid #4a90e2;
+                    background-color: #2d2d2d;
+                }
+                
+                QPushButton {
+                    background-color: #3d3d3d;
+                    border: 1px solid #4d4d4d;
+                    border-radius: 12px;
+                    font-size: 14px;
+                    font-weight: bold;
+                    color: #ffffff;
+                }
+                
+                QPushButton:hover {
+                    background-color: #4d4d4d;
+                    border-color: #5d5d5d;
+                }
+                
+                QPushButton:pressed {
+                    background-color: #5d5d5d;
+                }
+                
+                QTabWidget::pane {
+                    border: none;
+                    background-color: #2d2d2d;
+                }
+                
+                QTabBar::tab {
+                    background-color: #2d2d2d;
+                    border: none;
+                    border-top-left-radius: 4px;
+                    border-top-right-radius: 4px;
+                    padding: 5px 10px;
+                    margin-right: 2px;
+                    min-width: 80px;
+                    max-width: 180px;
+                    color: #b0b0b0;
+                    font-size: 12px;
+                }
+                
+                QTabBar::tab:selected {
+                    background-color: #1e1e1e;
+                    border-bottom: 2px solid #4a90e2;
+                    color: #ffffff;
+                }
+                
+                QTabBar::tab:hover:!selected {
+                    background-color: #3d3d3d;
+                    color: #ffffff;
+                }
+                
+                QTabBar::close-button {
+                    image: none;
+                    subcontrol-position: right;
+                    background-color: #d32f2f;
+                    border-radius: 2px;
+                    padding: 2px;
+                    width: 12px;
+                    height: 12px;
+                }
+                
+                QTabBar::close-button:hover {
+                    background-color: #f44336;
+                }
+                
+                QMenu {
+                    background-color: #2d2d2d;
+                    border: 1px solid #3d3d3d;
+                    border-radius: 4px;
+                    padding: 3px;
+                    color: #ffffff;
+                }
+                
+                QMenu::item {
+                    padding: 4px 20px;
+                    border-radius: 3px;
+                }
+                
+                QMenu::item:selected {
+                    background-color: #4a90e2;
+                    color: #ffffff;
+                }
+            """
+
+_LIGHT_QSS = """
+                QMainWindow {
+                    background-color: #f5f5f5;
+                }
+                
+                QToolBar {
+                    background-color: #ffffff;
+                    border-bottom: 1px solid #e0e0e0;
+                    padding: 3px;
+                    spacing: 3px;
+                }
+                
+                QToolBar QToolButton {
+                    background-color: transparent;
+                    border: none;
+                    border-radius: 3px;
+                    padding: 3px 6px;
+                    font-size: 13px;
+                    color: #000000;
+                }
+                
+                QToolBar QToolButton:hover {
+                    background-color: #e8e8e8;
+                }
+                
+                QToolBar QToolButton:pressed {
+                    background-color: #d0d0d0;
+                }
+                
+                QLineEdit {
+                    border: 1px solid #d0d0d0;
+                    border-radius: 12px;
+                    padding: 4px 10px;
+                    background-color: #f8f8f8;
+                    font-size: 12px;
+                    color: #000000;
+                }
+                
+                QLineEdit:focus {
+                    border: 1px solid #4a90e2;
+                    background-color: #ffffff;
+                }
+                
+                QPushButton {
+                    background-color: #f0f0f0;
+                    border: 1px solid #d0d0d0;
+                    border-radius: 12px;
+                    font-size: 14px;
+                    font-weight: bold;
+                    color: #555;
+                }
+                
+                QPushButton:hover {
+                    background-color: #e0e0e0;
+                    border-color: #b0b0b0;
+                }
+                
+                QPushButton:pressed {
+                    background-color: #d0d0d0;
+                }
+                
+                QTabWidget::pane {
+                    border: none;
+                    background-color: #ffffff;
+                }
+                
+                QTabBar::tab {
+                    background-color: #e8e8e8;
+                    border: none;
+                    border-top-left-radius: 4px;
+                    border-top-right-radius: 4px;
+                    padding: 5px 10px;
+                    margin-right: 2px;
+                    min-width: 80px;
+                    max-width: 180px;
+                    color: #555555;
+                    font-size: 12px;
+                }
+                
+                QTabBar::tab:selected {
+                    background-color: #ffffff;
+                    border-bottom: 2px solid #4a90e2;
+                    color: #000000;
+                }
+                
+                QTabBar::tab:hover:!selected {
+                    background-color: #d8d8d8;
+                }
+                
+                QTabBar::close-button {
+                    image: none;
+                    subcontrol-position: right;
+                    background-color: #d32f2f;
+                    border-radius: 2px;
+                    padding: 2px;
+                    width: 12px;
+                    height: 12px;
+                }
+                
+                QTabBar::close-button:hover {
+                    background-color: #f44336;
+                }
+                
+                QMenu {
+                    background-color: #ffffff;
+                    border: 1px solid #d0d0d0;
+                    border-radius: 4px;
+                    padding: 3px;
+                    color: #000000;
+                }
+                
+                QMenu::item {
+                    padding: 4px 20px;
+                    border-radius: 3px;
+                }
+                
+                QMenu::item:selected {
+                    background-color: #4a90e2;
+                    color: #ffffff;
+                }
+            """
+
+# Address-bar input is a URL if it carries a scheme (or //) or looks like a
+# bare dotted host with no spaces; everything else becomes a search query.
+# One compiled-regex pass instead of several separate string scans.
+_URL_RE = re.compile(r"^(?:[a-z][a-z0-9+.-]*:)?//|^[^\s]+\.[^\s]+$", re.I)
+
+
+# Well-known ad/tracker domains whose requests are dropped before any
+# socket or TLS work happens; subdomains match too.
+_BLOCKED_HOSTS = frozenset({
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "adservice.google.com",
+    "ads.yahoo.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+})
+
+
+class AdBlockInterceptor(QWebEngineUrlRequestInterceptor):
+    """Blocks requests to known ad/tracker hosts at the network layer."""
+
+    def interceptRequest(self, info):
+        host = info.requestUrl().host()
+        while host:
+            if host in _BLOCKED_HOSTS:
+                info.block(True)
+                return
+            dot = host.find(".")
+            if dot == -1:
+                break
+            host = host[dot + 1:]
+
+
+# --------------------------------------------------
+# Shared web profile
+# --------------------------------------------------
+
+def get_profile(app):
+    """Return the process-wide QWebEngineProfile, creating it on first use.
+
+    The profile is cached as a property on the QApplication so every
+    Portoco window shares one renderer pool, HTTP cache and cookie store.
+    """
+    profile = app.property("portoco_profile")
+    if profile is None:
+        profile = QWebEngineProfile("PortocoProfile", app)
+        profile.setPersistentStoragePath(_DATA_PATH)
+        profile.setPersistentCookiesPolicy(
+            QWebEngineProfile.PersistentCookiesPolicy.ForcePersistentCookies
+        )
+
+        # Performance optimizations
+        settings = profile.settings()
+        settings.setAttribute(settings.WebAttribute.PluginsEnabled, True)
+        settings.setAttribute(settings.WebAttribute.JavascriptEnabled, True)
+        settings.setAttribute(settings.WebAttribute.LocalStorageEnabled, True)
+        settings.setAttribute(settings.WebAttribute.AllowRunningInsecureContent, False)
+
+        # Heavy features this browser does not use; each one skipped is a
+        # Chromium subsystem that never initializes in the renderer
+        settings.setAttribute(settings.WebAttribute.WebGLEnabled, False)
+        settings.setAttribute(settings.WebAttribute.PdfViewerEnabled, False)
+        settings.setAttribute(settings.WebAttribute.ScreenCaptureEnabled, False)
+        settings.setAttribute(settings.WebAttribute.PlaybackRequiresUserGesture, True)
+        profile.setSpellCheckEnabled(False)
+
+        # Memory-only HTTP cache: no cache directory on disk, so subresource
+        # loads never pay for disk writes and the cache can't grow stale.
+        # Persistent storage above stays for cookies/localStorage only.
+        profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.MemoryHttpCache)
+        profile.setHttpCacheMaximumSize(100 * 1024 * 1024)  # 100MB cache
+
+        # Parented to the profile so the interceptor outlives this scope
+        profile.setUrlRequestInterceptor(AdBlockInterceptor(profile))
+
+        app.setProperty("portoco_profile", profile)
+    return profile
+
+
+# --------------------------------------------------
+# Main Window
+# --------------------------------------------------
+
+class Portoco(QMainWindow):
+    def __init__(self):
+        super().__init__()
+
+        self.setWindowTitle("Portoco")
+        self.resize(1200, 800)
+
+        # ---------- data folder ----------
+        self.data_path = _DATA_PATH
+
+        # ---------- web profile ----------
+        # One process-wide profile; a second window reuses the same renderer
+        # pool, cache and cookie store instead of allocating its own.
+        self.profile = get_profile(QApplication.instance())
+
+        # Warm DNS and the TLS session cache for the default search engine
+        # while the window is still being built, so the first navigation
+        # skips the resolve + handshake round-trips.
+        self._nam = QNetworkAccessManager(self)
+        req = QNetworkRequest(QUrl("https://duckduckgo.com"))
+        req.setAttribute(QNetworkRequest.Attribute.Http2AllowedAttribute, True)
+        reply = self._nam.head(req)
+        reply.finished.connect(reply.deleteLater)
+
+        # ---------- bookmarks ----------
+        # SoA layout: parallel title/url lists per folder instead of one
+        # tuple per bookmark
+        self.bookmarks = {}  # folder -> {"titles": [...], "urls": [...]}
+        self._bookmark_urls = {}  # folder -> set of urls for O(1) dup checks
+        self._folder_menus = {}  # folder -> QMenu, populated on first show
+        self._stale_folders = set()  # folders whose submenu needs repopulating
+
+        # Bookmark store: WAL-mode SQLite, written in debounced batches so a
+        # burst of additions costs one transaction (and one fsync), not one
+        # per bookmark.
+        self._db = sqlite3.connect(
+            os.path.join(self.data_path, "bookmarks.db"), isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS bm("
+            "folder TEXT, title TEXT, url TEXT, PRIMARY KEY(folder, url))"
+        )
+        self._dirty_bm = []  # queued (folder, title, url) rows
+        self._bm_flush_timer = QTimer(self)
+        self._bm_flush_timer.setSingleShot(True)
+        self._bm_flush_timer.setInterval(500)
+        self._bm_flush_timer.timeout.connect(self._flush_bookmarks)
+        QApplication.instance().aboutToQuit.connect(self._flush_bookmarks)
+
+        # ---------- lazy tabs ----------
+        self._pending = {}  # placeholder widget -> url to load on first show
+        self._last_active = None  # view whose page is in the Active state
+        self._view_index = {}  # widget -> tab index, avoids indexOf scans
+        self._pending_update = {}  # view -> True while a refresh is queued
+
+        # ---------- detect dark mode ----------
+        self.is_dark_mode = self.is_system_dark_mode()
+        hints = QApplication.styleHints()
+        if hasattr(hints, "colorSchemeChanged"):
+            # Event-driven theme swaps instead of a one-shot startup guess
+            hints.colorSchemeChanged.connect(self._on_color_scheme_changed)
+
+        # One shared callable for every "open default tab" entry point
+        self._new_default_tab = partial(self.add_tab, "https://duckduckgo.com")
+
+        # ---------- UI ----------
+        self.init_ui()
+        self.init_menu()
+        self.init_shortcuts()
+        self.apply_styles()
+
+        # ---------- stored bookmarks ----------
+        self._load_bookmarks_db()
+
+        # ---------- first tab ----------
+        self.add_tab("https://duckduckgo.com")
+
+    def is_system_dark_mode(self):
+        """Detect if system is in dark mode"""
+        hints = QApplication.styleHints()
+        if hasattr(hints, "colorScheme"):
+            return hints.colorScheme() == Qt.ColorScheme.Dark
+        # Pre-6.5 fallback: if the window background is dark (luminance
+        # < 128), assume dark mode
+        palette = QApplication.palette()
+        bg_color = palette.color(QPalette.ColorRole.Window)
+        return bg_color.lightness() < 128
+
+    def _on_color_scheme_changed(self, scheme):
+        self.is_dark_mode = scheme == Qt.ColorScheme.Dark
+        self.apply_styles()
+
+    # --------------------------------------------------
+    # UI
+    # --------------------------------------------------
+
+    def init_ui(self):
+        central = QWidget()
+        self.setCentralWidget(central)
+
+        layout = QVBoxLayout(central)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        # Navigation toolbar
+        nav_toolbar = QToolBar()
+        nav_toolbar.setMovable(False)
+        nav_toolbar.setIconSize(QSize(14, 14))
+        nav_toolbar.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextBesideIcon)
+        self.addToolBar(nav_toolbar)
+
+        # Back button
+        back_btn = self._icon_action("go-previous", "←", "Back", self.navigate_back)
+        nav_toolbar.addAction(back_btn)
+
+        # Forward button
+        forward_btn = self._icon_action("go-next", "→", "Forward", self.navigate_forward)
+        nav_toolbar.addAction(forward_btn)
+
+        # Reload button
+        reload_btn = self._icon_action("view-refresh", "⟳", "Reload", self.reload_page)
+        nav_toolbar.addAction(reload_btn)
+
+        nav_toolbar.addSeparator()
+
+        # URL bar
+        self.url_bar = QLineEdit()
+        self.url_bar.setPlaceholderText("Search or enter URL...")
+        self.url_bar.returnPressed.connect(self.navigate)
+        nav_toolbar.addWidget(self.url_bar)
+
+        # New tab button
+        new_tab_btn = QPushButton("+")
+        add_icon = QIcon.fromTheme("list-add")
+        if not add_icon.isNull():
+            new_tab_btn.setIcon(add_icon)
+            new_tab_btn.setText("")
+        new_tab_btn.setToolTip("New Tab (Ctrl+T)")
+        new_tab_btn.setFixedSize(24, 24)
+        new_tab_btn.clicked.connect(self._new_default_tab)
+        nav_toolbar.addWidget(new_tab_btn)
+
+        # Bookmark button
+        bookmark_btn = self._icon_action(
+            "bookmark-new", "⭐", "Add Bookmark", self.add_bookmark
+        )
+        nav_toolbar.addAction(bookmark_btn)
+
+        # Tabs
+        self.tabs = QTabWidget()
+        self.tabs.setDocumentMode(True)
+        self.tabs.setTabsClosable(True)
+        self.tabs.setMovable(True)
+        self.tabs.setElideMode(Qt.TextElideMode.ElideRight)
+        self.tabs.tabCloseRequested.connect(self.close_tab)
+        self.tabs.tabBar().tabMoved.connect(self._reindex_tabs)
+        self.tabs.currentChanged.connect(self._materialize_tab)
+        self.tabs.currentChanged.connect(self.sync_url_bar)
+
+        layout.addWidget(self.tabs)
+
+    def _icon_action(self, theme_name, fallback_glyph, tooltip, slot):
+        # Theme icons are rasterized once and cached by Qt's pixmap cache;
+        # the Unicode glyph is only used when no theme icon exists, since
+        # glyphs get re-shaped through the fallback font stack per paint.
+        icon = QIcon.fromTheme(theme_name)
+        if icon.isNull():
+            action = QAction(fallback_glyph, self)
+        else:
+            action = QAction(icon, "", self)
+        action.setToolTip(tooltip)
+        action.triggered.connect(slot)
+        return action
+
+    def apply_styles(self):
+        qss = _DARK_QSS if self.is_dark_mode else _LIGHT_QSS
+        if getattr(self, "_qss", None) is qss:
+            return
+        self._qss = qss
+        self.setStyleSheet(qss)
+
+    # --------------------------------------------------
+    # Navigation Controls
+    # --------------------------------------------------
+
+    def navigate_back(self):
+        current = self.current_tab()
+        if current:
+            current.back()
+
+    def navigate_forward(self):
+        current = self.current_tab()
+        if current:
+            current.forward()
+
+    def reload_page(self):
+        current = self.current_tab()
+        if current:
+            current.reload()
+
+    # --------------------------------------------------
+    # Tabs
+    # --------------------------------------------------
+
+    def add_tab(self, url=None):
+        # New tabs start as a lightweight placeholder; the QWebEngineView
+        # (and its renderer process) is only created when the tab is first
+        # shown, so opening many tabs at once stays cheap.
+        placeholder = QLabel("Loading…")
+        placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._pending[placeholder] = url
+
+        index = self.tabs.addTab(placeholder, "New Tab")
+        self._reindex_tabs()
+        self.tabs.setCurrentIndex(index)
+
+    def _reindex_tabs(self, *args):
+        # Structural changes are rare; rebuilding the map then keeps every
+        # update_tab lookup O(1) instead of a QTabBar linear scan.
+        self._view_index = {
+            self.tabs.widget(i): i for i in range(self.tabs.count())
+        }
+
+    def _materialize_tab(self, index):
+        placeholder = self.tabs.widget(index)
+        if placeholder not in self._pending:
+            return
+        url = self._pending.pop(placeholder)
+
+        # Qt 6.5+ lets the view create its page on our profile directly,
+        # skipping the separately-owned QWebEnginePage
+        view = QWebEngineView(self.profile)
+        view._last_title = None  # last values pushed to the tab bar/URL bar
+        view._last_url = None
+
+        view.urlChanged.connect(
+            lambda qurl, v=view: self._schedule_update(v)
+        )
+        view.loadFinished.connect(
+            lambda _, v=view: self._schedule_update(v)
+        )
+
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, view, "New Tab")
+        self._reindex_tabs()
+        self.tabs.setCurrentIndex(index)
+        placeholder.deleteLater()
+
+        if url:
+            view.setUrl(QUrl(url))
+
+    def close_tab(self, index):
+        if self.tabs.count() > 1:
+            widget = self.tabs.widget(index)
+            self._pending.pop(widget, None)
+            self._pending_update.pop(widget, None)
+            if self._last_active is widget:
+                self._last_active = None
+            self.tabs.removeTab(index)
+            self._reindex_tabs()
+
+    def _schedule_update(self, view):
+        # Coalesce the urlChanged/loadFinished burst of a single page load
+        # into one tab-title/URL-bar refresh ~50 ms later.
+        if self._pending_update.get(view):
+            return
+        self._pending_update[view] = True
+        QTimer.singleShot(50, lambda: self._do_update(view))
+
+    def _do_update(self, view):
+        # pop, not assignment: the view may have been closed (and removed
+        # from this dict) while the refresh was in flight
+        self._pending_update.pop(view, None)
+        if view in self._view_index:
+            self.update_tab(view, view.url())
+
+    def update_tab(self, view, qurl):
+        i = self._view_index.get(view, -1)
+        if i != -1:
+            title = view.page().title() or "New Tab"
+            # Limit tab title length
+            if len(title) > 20:
+                title = title[:17] + "..."
+            # Skip the Qt call (and tab-bar relayout) when nothing changed
+            if title != view._last_title:
+                self.tabs.setTabText(i, title)
+                view._last_title = title
+        if view == self.tabs.currentWidget():
+            url = qurl.toString()
+            if url != view._last_url:
+                self.url_bar.setText(url)
+                view._last_url = url
+
+    def current_tab(self):
+        view = self.tabs.currentWidget()
+        # Placeholders have no web API; callers treat them as "no tab yet"
+        return view if isinstance(view, QWebEngineView) else None
+
+    # --------------------------------------------------
+    # Navigation
+    # --------------------------------------------------
+
+    def navigate(self):
+        text = self.url_bar.text().strip()
+        if not text:
+            return
+
+        if _URL_RE.match(text):
+            if "://" not in text:
+                text = "https://" + text
+        else:
+            text = "https://duckduckgo.com/?" + urlencode({"q": text})
+
+        current = self.current_tab()
+        if current:
+            current.setUrl(QUrl(text))
+
+    def sync_url_bar(self, index):
+        view = self.tabs.widget(index)
+        if isinstance(view, QWebEngineView):
+            self.url_bar.setText(view.url().toString())
+            self._activate_view(view)
+
+    def _activate_view(self, view):
+        # Freeze the previously current page so background tabs stop
+        # running JS timers/rAF; needs the Qt 6.5+ lifecycle API.
+        if not hasattr(QWebEnginePage, "LifecycleState"):
+            return
+        previous = self._last_active
+        if previous is not None and previous is not view:
+            previous.page().setLifecycleState(
+                QWebEnginePage.LifecycleState.Frozen
+            )
+        view.page().setLifecycleState(QWebEnginePage.LifecycleState.Active)
+        self._last_active = view
+
+    # --------------------------------------------------
+    # Menu
+    # --------------------------------------------------
+
+    def init_menu(self):
+        menubar = self.menuBar()
+
+        file_menu = menubar.addMenu("File")
+        new_tab = QAction("New Tab", self)
+        new_tab.triggered.connect(self._new_default_tab)
+        file_menu.addAction(new_tab)
+
+        self.bookmarks_menu = menubar.addMenu("Bookmarks")
+        add_bm = QAction("Add Bookmark", self)
+        add_bm.triggered.connect(self.add_bookmark)
+        self.bookmarks_menu.addAction(add_bm)
+        self.bookmarks_menu.addSeparator()
+
+    def init_shortcuts(self):
+        new_tab = QAction(self)
+        new_tab.setShortcut(QKeySequence("Ctrl+T"))
+        new_tab.triggered.connect(self._new_default_tab)
+        self.addAction(new_tab)
+
+    # --------------------------------------------------
+    # Bookmarks
+    # --------------------------------------------------
+
+    def add_bookmark(self):
+        current = self.current_tab()
+        if not current:
+            return
+
+        url = current.url().toString()
+        title = current.page().title() or url
+
+        folders = list(self.bookmarks.keys())
+
+        # Folder selector
+        if folders:
+            folder, ok = QInputDialog.getItem(
+                self,
+                "Choose Bookmark Folder",
+                "Select a folder:",
+                folders + ["➕ Create new folder"],
+                0,
+                False
+            )
+            if not ok:
+                return
+
+            if folder == "➕ Create new folder":
+                folder, ok = QInputDialog.getText(
+                    self,
+                    "New Folder",
+                    "Folder name:"
+                )
+                if not ok or not folder.strip():
+                    return
+                folder = folder.strip()
+        else:
+            folder, ok = QInputDialog.getText(
+                self,
+                "New Folder",
+                "Folder name:",
+                text="Bookmarks"
+            )
+            if not ok or not folder.strip():
+                return
+            folder = folder.strip()
+
+        # Prevent duplicates
+        urls = self._bookmark_urls.setdefault(folder, set())
+        if url in urls:
+            return
+        urls.add(url)
+
+        data = self.bookmarks.setdefault(folder, {"titles": [], "urls": []})
+        data["titles"].append(title)
+        data["urls"].append(url)
+        self._ensure_folder_menu(folder)
+        self._stale_folders.add(folder)
+        self._dirty_bm.append((folder, title, url))
+        self._bm_flush_timer.start()
+
+    def _flush_bookmarks(self):
+        if not self._dirty_bm:
+            return
+        self._db.execute("BEGIN")
+        self._db.executemany(
+            "INSERT OR IGNORE INTO bm(folder, title, url) VALUES(?, ?, ?)",
+            self._dirty_bm,
+        )
+        self._db.execute("COMMIT")
+        self._dirty_bm.clear()
+
+    def _load_bookmarks_db(self):
+        rows = self._db.execute("SELECT folder, title, url FROM bm")
+        for folder, title, url in rows:
+            urls = self._bookmark_urls.setdefault(folder, set())
+            if url in urls:
+                continue
+            urls.add(url)
+            data = self.bookmarks.setdefault(folder, {"titles": [], "urls": []})
+            data["titles"].append(title)
+            data["urls"].append(url)
+            self._ensure_folder_menu(folder)
+            self._stale_folders.add(folder)
+
+    def _ensure_folder_menu(self, folder):
+        # The submenu exists in the menubar right away but stays empty; its
+        # QActions are only materialized when the user actually hovers it.
+        folder_menu = self._folder_menus.get(folder)
+        if folder_menu is None:
+            folder_menu = QMenu(folder, self)
+            folder_menu.aboutToShow.connect(
+                lambda m=folder_menu, f=folder: self._populate_folder(m, f)
+            )
+            self._folder_menus[folder] = folder_menu
+            self.bookmarks_menu.addMenu(folder_menu)
+        return folder_menu
+
+    def _populate_folder(self, menu, folder):
+        if menu.property("built") and folder not in self._stale_folders:
+            return
+        self._stale_folders.discard(folder)
+        menu.clear()
+        data = self.bookmarks.get(folder)
+        if not data:
+            return
+        for title, url in zip(data["titles"], data["urls"]):
+            action = QAction(title, self)
+            action.setData(url)
+            action.triggered.connect(self._open_bookmark)
+            menu.addAction(action)
+        menu.setProperty("built", True)
+
+    def _open_bookmark(self):
+        current = self.current_tab()
+        if current:
+            current.setUrl(QUrl(self.sender().data()))
+
+    def build_bookmarks_menu(self):
+        # Full rebuild; only needed when replacing the whole bookmark store
+        self.bookmarks_menu.clear()
+        self._folder_menus.clear()
+
+        add_bm = QAction("Add Bookmark", self)
+        add_bm.triggered.connect(self.add_bookmark)
+        self.bookmarks_menu.addAction(add_bm)
+        self.bookmarks_menu.addSeparator()
+
+        for folder in self.bookmarks:
+            self._ensure_folder_menu(folder)
+            self._stale_folders.add(folder)
+
+
+# --------------------------------------------------
+# Run
+# --------------------------------------------------
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    browser = Portoco()
+    browser.show()
+    sys.exit(app.exec())
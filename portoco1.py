@@ -1,14 +1,71 @@
 import sys
 import os
+import mmap
+import sqlite3
+import time
+from collections import deque
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QToolBar, QLineEdit,
     QTabBar, QMenu, QFileDialog
 )
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
-from PySide6.QtCore import QUrl, Qt, QSize
+from PySide6.QtCore import QUrl, Qt, QSize, QObject, QTimer, QRunnable, QThreadPool, QMutex, Signal
 from PySide6.QtGui import QAction, QFont, QKeySequence, QIcon  # <-- QAction MUST come from QtGui
 
+# Inputs already carrying one of these schemes are loaded as-is;
+# anything else gets https:// prepended
+_SCHEMES = ("http://", "https://", "about:", "file://", "data:", "ftp://")
+
+# Most recent entries shown in the History menu
+HISTORY_MENU_MAX = 200
+
+# Oldest per-tab history entries are evicted past this point
+HISTORY_MAX_PER_TAB = 500
+
+# Buffered history rows are flushed early once the batch reaches this size
+HISTORY_FLUSH_BATCH = 64
+
+# Tab-independent history kept in memory for the History menu
+GLOBAL_HISTORY_MAX = 5000
+
+# Closed webviews kept around for reuse instead of respawning a renderer
+VIEW_POOL_MAX = 4
+
+
+class _SaveJob(QRunnable):
+    """Runs one persistence callable on a pool thread."""
+
+    def __init__(self, fn):
+        super().__init__()
+        self._fn = fn
+
+    def run(self):
+        self._fn()
+
+
+class _BookmarkLoader(QObject, QRunnable):
+    """Reads the bookmark rows on a pool thread and hands them back via
+    a signal, so the GUI thread only ever builds menu entries."""
+
+    done = Signal(list)
+
+    def __init__(self, db, lock):
+        QObject.__init__(self)
+        QRunnable.__init__(self)
+        self._db = db
+        self._lock = lock
+
+    def run(self):
+        self._lock.lock()
+        try:
+            rows = self._db.execute(
+                "SELECT url, title FROM bookmarks ORDER BY ts"
+            ).fetchall()
+        finally:
+            self._lock.unlock()
+        self.done.emit(rows)
+
 
 class Portoco(QMainWindow):
     def __init__(self):
@@ -20,10 +77,43 @@ class Portoco(QMainWindow):
         self.data_path = os.path.join(os.getcwd(), "portoco_data")
         os.makedirs(self.data_path, exist_ok=True)
 
+        # One SQLite store for bookmarks and history: WAL so reads never
+        # block the writer, NORMAL sync for cheap commits, and dedup is an
+        # INSERT OR IGNORE against the primary key instead of a file scan.
+        self.db = sqlite3.connect(
+            os.path.join(self.data_path, "portoco.db"),
+            isolation_level=None, check_same_thread=False
+        )
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS bookmarks(url TEXT PRIMARY KEY, title TEXT, ts REAL)"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS history(url TEXT, ts REAL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_history_url ON history(url)")
+        # Serializes writes issued from pool threads
+        self._io_lock = QMutex()
+
+        # History rows are buffered and flushed as one transaction every
+        # two seconds, or sooner when the batch fills
+        self._hist_buffer = []
+        self._hist_timer = QTimer(self)
+        self._hist_timer.setInterval(2000)
+        self._hist_timer.timeout.connect(self._flush_history)
+        self._hist_timer.start()
+
         # Persistent profile
         self.profile = QWebEngineProfile("Portoco", self)
         self.profile.setPersistentCookiesPolicy(QWebEngineProfile.ForcePersistentCookies)
         self.profile.setPersistentStoragePath(self.data_path)
+        # Explicit disk cache so repeat visits serve assets from disk
+        # instead of the network; Qt's default ceiling is far smaller
+        self.profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+        self.profile.setHttpCacheMaximumSize(512 * 1024 * 1024)
+        self.profile.setCachePath(os.path.join(self.data_path, "httpcache"))
+        # The profile is shared, so this must be connected exactly once;
+        # doing it per tab stacked one save dialog per open tab
+        self.profile.downloadRequested.connect(self.handle_download)
 
         # Tabs
         self.tabs = QTabWidget()
@@ -80,23 +170,48 @@ class Portoco(QMainWindow):
         self.add_bookmark_action.triggered.connect(self.add_bookmark)
         self.bookmarks_menu.addAction(self.add_bookmark_action)
         self.bookmarks_list = []
+        self._bookmark_urls = set()  # kept in lockstep for O(1) dup checks
 
         self.history_menu = menubar.addMenu("History")
         self.history = {}  # tab -> list of urls
+        self._hist_sets = {}  # tab -> set of urls, mirrors self.history
+        # Restored from disk at startup and fed by every visit; the
+        # History menu renders from this deque, not from any one tab
+        self._global_history = deque(maxlen=GLOBAL_HISTORY_MAX)
+        self._global_seen = set()
+        self._view_pool = []  # detached views awaiting reuse
+        self._prev_view = None  # frozen when the user switches away
+
+        # Background tabs frozen on switch are discarded entirely once
+        # they have sat untouched for ten minutes
+        self._discard_timer = QTimer(self)
+        self._discard_timer.setInterval(60 * 1000)
+        self._discard_timer.timeout.connect(self._discard_stale_tabs)
+        self._discard_timer.start()
+        # Rebuilt lazily when the menu is actually opened, reusing a pool
+        # of QActions rather than destroying and recreating them
+        self._history_dirty = True
+        self._hist_action_pool = []
+        self.history_menu.aboutToShow.connect(self._rebuild_history_menu)
 
         # Shortcuts
         self.init_shortcuts()
 
         # Load persistent bookmarks and history
-        self.load_bookmarks()
-        self.load_history()
+        self._import_legacy_logs()
+        # Bookmarks warm on a pool thread; the menu fills from the done
+        # signal on the GUI thread, so first paint never waits on the read
+        self._bm_loader = _BookmarkLoader(self.db, self._io_lock)
+        self._bm_loader.setAutoDelete(False)
+        self._bm_loader.done.connect(self._apply_bookmarks)
+        QThreadPool.globalInstance().start(self._bm_loader)
+        self._load_history_from_disk()
 
-        # Open first tab
-        self.add_tab("https://duckduckgo.com")
+        # Open first tab; the load is deferred so the window paints first
+        self.add_tab("https://duckduckgo.com", defer=True)
 
-        # Save on exit
-        app.aboutToQuit.connect(self.save_bookmarks)
-        app.aboutToQuit.connect(self.save_history)
+        # Flush and close the store on exit
+        app.aboutToQuit.connect(self._close_db)
 
     # Shortcuts
     def init_shortcuts(self):
@@ -130,21 +245,40 @@ class Portoco(QMainWindow):
         return self.tabs.currentWidget()
 
     # Tabs
-    def add_tab(self, url):
-        view = QWebEngineView()
-        view.setPage(QWebEnginePage(self.profile, view))
-        view.setUrl(QUrl(url))
+    def add_tab(self, url, defer=False):
+        # Reuse a pooled view when one is available: reparenting a widget
+        # is far cheaper than spawning a fresh renderer process
+        if self._view_pool:
+            view = self._view_pool.pop()
+        else:
+            view = QWebEngineView()
+            view.setPage(QWebEnginePage(self.profile, view))
+            # Coalesces urlChanged bursts (redirect chains, SPA route
+            # hops): only the URL still current 150 ms later is recorded
+            timer = QTimer(view)
+            timer.setSingleShot(True)
+            timer.setInterval(150)
+            timer.timeout.connect(lambda v=view: self.update_url_bar(v))
+            view._coalesce_timer = timer
+        if defer:
+            # Posted to the event loop so the chrome paints before the
+            # renderer spins up and the network kicks in
+            QTimer.singleShot(0, lambda v=view, u=url: v.setUrl(QUrl(u)))
+        else:
+            view.setUrl(QUrl(url))
         view.setZoomFactor(1.0)
-        self.history[view] = [url]
+        self.history[view] = deque([url], maxlen=HISTORY_MAX_PER_TAB)
+        self._hist_sets[view] = {url}
 
-        # Update address bar and tab title
-        view.urlChanged.connect(lambda u, v=view: self.update_url_bar(v))
-        view.titleChanged.connect(lambda t, v=view: self.update_tab_title(v, t))
-        view.urlChanged.connect(lambda u, v=view: self.update_history_menu(v))
-        view.iconChanged.connect(lambda i, v=view: self.update_tab_icon(v, i))
+        # Update address bar and tab title; handles are kept so close_tab
+        # can disconnect before pooling the view
+        view._conn_handles = [
+            view.urlChanged.connect(lambda u, v=view: v._coalesce_timer.start()),
+            view.titleChanged.connect(lambda t, v=view: self.update_tab_title(v, t)),
+            view.urlChanged.connect(lambda u, v=view: self.update_history_menu(v)),
+            view.iconChanged.connect(lambda i, v=view: self.update_tab_icon(v, i)),
+        ]
 
-        # Downloads
-        view.page().profile().downloadRequested.connect(self.handle_download)
 
         self.tabs.addTab(view, "New Tab")
         self.tabs.setCurrentWidget(view)
@@ -155,29 +289,51 @@ class Portoco(QMainWindow):
             tab = self.tabs.widget(index)
             if tab in self.history:
                 del self.history[tab]
+            self._hist_sets.pop(tab, None)
+            if self._prev_view is tab:
+                self._prev_view = None
+            for handle in getattr(tab, "_conn_handles", ()):
+                QObject.disconnect(handle)
+            tab._conn_handles = []
+            tab._coalesce_timer.stop()
             self.tabs.removeTab(index)
+            tab.stop()
+            tab.setUrl(QUrl("about:blank"))
+            # Clear per-life state so a recycled view doesn't early-out
+            # of update_url_bar on its first navigation
+            tab._last_url = None
+            tab._frozen_at = None
+            if len(self._view_pool) < VIEW_POOL_MAX:
+                self._view_pool.append(tab)
+            else:
+                tab.deleteLater()
 
     # Navigation
     def load_url(self):
         url_text = self.url_bar.text().strip()
         if not url_text:
             return
-        if not url_text.startswith(("http://","https://")):
-            url_text = "http://" + url_text
+        if not url_text.startswith(_SCHEMES):
+            url_text = "https://" + url_text
         current = self.current_tab()
         if current:
             current.setUrl(QUrl(url_text))
             current.setFocus()
-            if url_text not in self.history[current]:
-                self.history[current].append(url_text)
+            self._remember_url(current, url_text)
+            self._remember_global(url_text)
             self.update_history_menu(current.url())
 
     def update_url_bar(self, view):
         url = view.url().toString()
+        # replaceState and fragment churn can fire urlChanged with the
+        # same canonical URL; skip the whole update in that case
+        if getattr(view, "_last_url", None) == url:
+            return
+        view._last_url = url
         if view == self.current_tab():
             self.url_bar.setText(url)
-        if url not in self.history[view]:
-            self.history[view].append(url)
+        self._remember_url(view, url)
+        self._remember_global(url)
         self.update_history_menu(view.url())
 
     def update_tab_title(self, view, title):
@@ -195,65 +351,184 @@ class Portoco(QMainWindow):
         current = self.current_tab()
         url = current.url().toString()
         title = current.title() or url
-        if url not in [b[0] for b in self.bookmarks_list]:
+        if url not in self._bookmark_urls:
+            self._bookmark_urls.add(url)
             self.bookmarks_list.append((url, title))
             action = QAction(title, self)
-            action.triggered.connect(lambda checked, u=url: self.load_bookmark(u))
+            action.setData(QUrl.fromUserInput(url))
+            action.triggered.connect(self._on_bookmark_action)
             self.bookmarks_menu.addAction(action)
-            self.save_bookmarks()
+            self._db_write(
+                "INSERT OR IGNORE INTO bookmarks VALUES(?, ?, ?)",
+                (url, title, time.time()),
+            )
 
-    def load_bookmark(self, url):
+    def load_bookmark(self, qurl):
         current = self.current_tab()
-        current.setUrl(QUrl(url))
+        current.setUrl(qurl)
         current.setFocus()
 
-    def save_bookmarks(self):
-        path = os.path.join(self.data_path, "bookmarks.txt")
-        with open(path, "w", encoding="utf-8") as f:
-            for url, title in self.bookmarks_list:
-                f.write(f"{title}|{url}\n")
-
-    def load_bookmarks(self):
-        path = os.path.join(self.data_path, "bookmarks.txt")
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    title, url = line.strip().split("|", 1)
-                    self.bookmarks_list.append((url, title))
-                    action = QAction(title, self)
-                    action.triggered.connect(lambda checked, u=url: self.load_bookmark(u))
-                    self.bookmarks_menu.addAction(action)
+    def _db_write(self, sql, params):
+        # Params are snapshotted into the closure, so the worker never
+        # touches the live lists; the mutex serializes the connection.
+        def write():
+            self._io_lock.lock()
+            try:
+                self.db.execute(sql, params)
+            finally:
+                self._io_lock.unlock()
+        QThreadPool.globalInstance().start(_SaveJob(write))
+
+    @staticmethod
+    def _read_lines_mmap(path):
+        # Bulk read: map the whole file, decode once and split, instead of
+        # per-line reads that allocate and decode a string at a time
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                lines = mm[:].decode("utf-8").splitlines()
+            finally:
+                mm.close()
+        return lines
+
+    def _import_legacy_logs(self):
+        # One-time migration of the old plain-text stores into SQLite;
+        # the files are renamed afterwards so this never runs twice
+        bm_path = os.path.join(self.data_path, "bookmarks.txt")
+        if os.path.exists(bm_path) and os.path.getsize(bm_path):
+            ts = time.time()
+            rows = []
+            for line in self._read_lines_mmap(bm_path):
+                if line:
+                    title, url = line.split("|", 1)
+                    rows.append((url, title, ts))
+            self.db.execute("BEGIN")
+            self.db.executemany("INSERT OR IGNORE INTO bookmarks VALUES(?, ?, ?)", rows)
+            self.db.execute("COMMIT")
+            os.rename(bm_path, bm_path + ".imported")
+
+        hist_path = os.path.join(self.data_path, "history.txt")
+        if os.path.exists(hist_path) and os.path.getsize(hist_path):
+            ts = time.time()
+            rows = [(line, ts) for line in self._read_lines_mmap(hist_path) if line]
+            self.db.execute("BEGIN")
+            self.db.executemany("INSERT INTO history VALUES(?, ?)", rows)
+            self.db.execute("COMMIT")
+            os.rename(hist_path, hist_path + ".imported")
+
+    def _apply_bookmarks(self, rows):
+        # Delivered on the GUI thread via _BookmarkLoader.done
+        for url, title in rows:
+            if url in self._bookmark_urls:
+                continue
+            self._bookmark_urls.add(url)
+            self.bookmarks_list.append((url, title))
+            action = QAction(title, self)
+            action.setData(QUrl.fromUserInput(url))
+            action.triggered.connect(self._on_bookmark_action)
+            self.bookmarks_menu.addAction(action)
 
     # History
     def update_history_menu(self, qurl):
-        self.history_menu.clear()
-        current = self.current_tab()
-        if current:
-            for url in reversed(self.history[current]):
-                action = QAction(url, self)
-                action.triggered.connect(lambda checked, u=url: self.load_history(u))
-                self.history_menu.addAction(action)
+        # Just mark stale; the rebuild happens on aboutToShow
+        self._history_dirty = True
 
-    def load_history(self, url):
+    def _rebuild_history_menu(self):
+        if not self._history_dirty:
+            return
+        self._history_dirty = False
+        entries = list(self._global_history)[-HISTORY_MENU_MAX:]
+        pool = self._hist_action_pool
+        for i, url in enumerate(reversed(entries)):
+            if i < len(pool):
+                action = pool[i]
+            else:
+                action = QAction(self)
+                action.triggered.connect(self._on_history_action)
+                self.history_menu.addAction(action)
+                pool.append(action)
+            action.setText(url)
+            # Parsed once here; the dispatch slot reuses the QUrl on
+            # every click instead of re-parsing the string
+            action.setData(QUrl.fromUserInput(url))
+            action.setVisible(True)
+        # Surplus actions are hidden, not destroyed
+        for action in pool[len(entries):]:
+            action.setVisible(False)
+
+    # One slot per menu kind; the triggering action carries its URL, so
+    # no per-action closure is needed
+    def _on_bookmark_action(self):
+        self.load_bookmark(self.sender().data())
+
+    def _on_history_action(self):
+        self.load_history(self.sender().data())
+
+    def load_history(self, qurl):
         current = self.current_tab()
-        current.setUrl(QUrl(url))
+        current.setUrl(qurl)
         current.setFocus()
 
-    def save_history(self):
-        path = os.path.join(self.data_path, "history.txt")
-        with open(path, "w", encoding="utf-8") as f:
-            for tab, urls in self.history.items():
-                for url in urls:
-                    f.write(f"{url}\n")
-
-    def load_history(self):
-        path = os.path.join(self.data_path, "history.txt")
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    url = line.strip()
-                    if self.current_tab():
-                        self.history[self.current_tab()].append(url)
+    def _flush_history(self):
+        if not self._hist_buffer:
+            return
+        batch, self._hist_buffer = self._hist_buffer, []
+
+        def write():
+            self._io_lock.lock()
+            try:
+                self.db.execute("BEGIN")
+                self.db.executemany("INSERT INTO history VALUES(?, ?)", batch)
+                self.db.execute("COMMIT")
+            finally:
+                self._io_lock.unlock()
+        QThreadPool.globalInstance().start(_SaveJob(write))
+
+    def _close_db(self):
+        # Final flush, then let in-flight write jobs land before closing
+        self._flush_history()
+        QThreadPool.globalInstance().waitForDone()
+        self.db.close()
+
+    def _remember_url(self, view, url):
+        # Keeps the companion set in lockstep with the capped deque: when
+        # the deque evicts its oldest URL the set forgets it too, so a
+        # later revisit counts as new. Returns True for new entries.
+        seen = self._hist_sets[view]
+        if url in seen:
+            return False
+        urls = self.history[view]
+        if len(urls) == urls.maxlen:
+            seen.discard(urls[0])
+        urls.append(url)
+        seen.add(url)
+        # Persist from here so every caller — typed URLs included —
+        # reaches the database, not just the urlChanged path
+        self._hist_buffer.append((url, time.time()))
+        if len(self._hist_buffer) >= HISTORY_FLUSH_BATCH:
+            self._flush_history()
+        return True
+
+    def _remember_global(self, url):
+        if url in self._global_seen:
+            return
+        if len(self._global_history) == self._global_history.maxlen:
+            self._global_seen.discard(self._global_history[0])
+        self._global_history.append(url)
+        self._global_seen.add(url)
+
+    def _load_history_from_disk(self):
+        # Read once at startup into the tab-independent store; menu
+        # rebuilds work from that deque, never from the database. The
+        # bookmark loader may already be running on the pool, so this
+        # read takes the same mutex as every other connection user.
+        self._io_lock.lock()
+        try:
+            rows = self.db.execute("SELECT url FROM history ORDER BY ts").fetchall()
+        finally:
+            self._io_lock.unlock()
+        for (url,) in rows:
+            self._remember_global(url)
 
     # Downloads
     def handle_download(self, download):
@@ -262,15 +537,49 @@ class Portoco(QMainWindow):
             download.setPath(path)
             download.accept()
 
+    # Tab lifecycle
+    def _discard_stale_tabs(self):
+        if not hasattr(QWebEnginePage, "LifecycleState"):
+            return
+        now = time.monotonic()
+        current = self.current_tab()
+        for i in range(self.tabs.count()):
+            view = self.tabs.widget(i)
+            frozen_at = getattr(view, "_frozen_at", None)
+            if view is current or frozen_at is None:
+                continue
+            if now - frozen_at > 600:
+                view.page().setLifecycleState(QWebEnginePage.LifecycleState.Discarded)
+                view._frozen_at = None
+
     # Update address bar when switching tabs
     def update_url(self, index):
         view = self.tabs.widget(index)
+        # Only the visible tab keeps an Active page; the one we just left
+        # is frozen so its renderer stops burning CPU
+        if hasattr(QWebEnginePage, "LifecycleState"):
+            prev = self._prev_view
+            if prev is not None and prev is not view and self.tabs.indexOf(prev) >= 0:
+                prev.page().setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
+                prev._frozen_at = time.monotonic()
+            if view:
+                view.page().setLifecycleState(QWebEnginePage.LifecycleState.Active)
+                view._frozen_at = None
+        self._prev_view = view
         if view:
             self.url_bar.setText(view.url().toString())
             view.setFocus()
+        self._history_dirty = True
 
 # Main
 if __name__ == "__main__":
+    # One renderer per site instead of per tab; must be set before
+    # QApplication spins up Chromium
+    os.environ.setdefault(
+        "QTWEBENGINE_CHROMIUM_FLAGS",
+        "--process-per-site"
+        " --disk-cache-size=536870912 --media-cache-size=134217728",
+    )
     app = QApplication(sys.argv)
     browser = Portoco()
     browser.show()